@@ -1,9 +1,11 @@
 import os
 import sys
+import argparse
 import logging
-from src.data.loader import load_data
-from src.features.build_features import DataBuilder
+from src.data.monitor import check_drift, has_drift, REFERENCE_PROFILE_PATH
+from src.features.feature_store import load_features
 from src.models.train_model import ModelTrainer
+from src.models.pricing import PricingEngine
 
 # Configure logging
 logging.basicConfig(
@@ -11,9 +13,10 @@ logging.basicConfig(
 )
 
 
-def main():
+def main(fail_on_drift=False):
     """
     Main pipeline execution: Load -> Preprocess -> Train -> Evaluate.
+    Returns a process exit status (non-zero when the run was aborted).
     """
     logging.info("Starting End-to-End Pipeline...")
 
@@ -21,50 +24,59 @@ def main():
     data_path = "data/raw/MachineLearningRating.txt"
     if not os.path.exists(data_path):
         logging.error(f"Data file not found at {data_path}")
-        return
+        return 1
 
-    logging.info("Loading data...")
-    df_raw = load_data(data_path)
+    # 1b. Drift & Data-Quality Check (single streaming pass over the new drop)
+    logging.info("Checking new data against training profile...")
+    profile, report = check_drift(data_path, report_path="reports/drift_report.csv")
+    drifted = has_drift(report)
+    if drifted and fail_on_drift:
+        logging.error("Drift detected. Aborting before retraining.")
+        return 1
 
-    # 2. Preprocess
-    logging.info("Building features...")
-    builder = DataBuilder(df_raw)
-    builder.preprocess()
+    # 2. Preprocess (cached in the memory-mapped feature store)
+    logging.info("Loading features...")
+    builder = load_features(data_path)
 
-    # 3. Train Models
+    # 3. Train Models (every target in src/models/targets.py, one data load)
     trainer = ModelTrainer()
+    trainer.train_all(builder)
 
-    # Severity Model (Regression)
-    logging.info("--- Pipeline: Claim Severity Model ---")
-    X_sev, y_sev = builder.get_severity_data()
-    X_train_s, X_test_s, y_train_s, y_test_s = builder.split_data(X_sev, y_sev)
-    trainer.train_severity_models(X_train_s, X_test_s, y_train_s, y_test_s)
+    # 4. Save Artifacts (all models already on disk; publish the best pair)
+    # Prefer XGBoost, else RF, among models trained in *this* run only
+    severity_name = trainer.best_trained("Severity")
+    probability_name = trainer.best_trained("Probability")
+    trainer.save_model(severity_name, "models/severity_model.pkl")
+    trainer.save_model(probability_name, "models/probability_model.pkl")
 
-    # Probability Model (Classification)
-    logging.info("--- Pipeline: Claim Probability Model ---")
-    X_prob, y_prob = builder.get_probability_data()
-    X_train_p, X_test_p, y_train_p, y_test_p = builder.split_data(X_prob, y_prob)
-    trainer.train_probability_models(X_train_p, X_test_p, y_train_p, y_test_p)
+    # The reference always describes the data the published models were
+    # trained on. Use --fail-on-drift to keep a drifted drop from becoming
+    # either the models or the reference.
+    if drifted:
+        logging.warning("Retrained on a drifted drop. Re-baselining the reference.")
+    profile.save(REFERENCE_PROFILE_PATH)
 
-    # 4. Save Artifacts
-    if not os.path.exists("models"):
-        os.makedirs("models")
-
-    # Save best models (Example: using XGBoost if available, else RF)
-    if "Severity_XGB" in trainer.models:
-        trainer.save_model("Severity_XGB", "models/severity_model.pkl")
-    else:
-        trainer.save_model("Severity_RF", "models/severity_model.pkl")
-
-    if "Probability_XGB" in trainer.models:
-        trainer.save_model("Probability_XGB", "models/probability_model.pkl")
-    else:
-        trainer.save_model("Probability_RF", "models/probability_model.pkl")
+    # 5. Price the Book (Expected Loss x Loadings)
+    logging.info("--- Pipeline: Risk-Based Pricing ---")
+    pricing = PricingEngine()
+    X_prob, _ = builder.get_probability_data()
+    pricing.predict_expected_loss(X_prob)
+    pricing.save_predictions("models/policy_predictions.pkl")
+    priced = pricing.compute_premiums()
+    tables = pricing.build_rate_tables(priced, builder.df, builder.encoders)
+    pricing.write_rate_tables(tables)
 
     logging.info("Pipeline Complete. Models saved to 'models/' directory.")
     print("\n--- Final Results ---")
     print(trainer.get_results())
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="End-to-end training pipeline.")
+    parser.add_argument(
+        "--fail-on-drift",
+        action="store_true",
+        help="Abort before retraining and re-baselining if the drift check fails.",
+    )
+    sys.exit(main(fail_on_drift=parser.parse_args().fail_on_drift))
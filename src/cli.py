@@ -0,0 +1,176 @@
+"""
+Unified command-line entry point.
+
+    python -m src.cli pipeline
+    python -m src.cli score --output reports/premiums.csv
+    python -m src.cli stats
+    python -m src.cli dashboard
+    python -m src.cli monitor --data data/raw/new_drop.txt
+
+Only argparse and the standard library are imported up front; each
+subcommand imports pandas/sklearn/XGBoost/matplotlib when it runs, so
+--help and short jobs start quickly. Pass --profile-imports to print how
+long each top-level package took to import (via python -X importtime).
+"""
+
+import argparse
+import logging
+import subprocess
+import sys
+
+DATA_PATH = "data/raw/MachineLearningRating.txt"
+
+
+def profile_imports(argv):
+    """
+    Re-runs the command under `python -X importtime` and prints each
+    top-level package's share of import time (self time of every module,
+    nested imports included, attributed to its top-level package).
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "src.cli", *argv],
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+
+    timings = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:"):
+            print(line, file=sys.stderr)
+            continue
+        fields = line[len("import time:") :].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # header row
+        root = fields[2].strip().partition(".")[0]
+        timings[root] = timings.get(root, 0) + int(fields[0])
+
+    total = sum(timings.values())
+    print("\n--- Import Time Breakdown ---")
+    for name, usecs in sorted(timings.items(), key=lambda kv: -kv[1])[:25]:
+        print(f"{name:<24}{usecs / 1000:>10.1f} ms")
+    print(f"{'TOTAL':<24}{total / 1000:>10.1f} ms")
+    return proc.returncode
+
+
+def cmd_pipeline(args):
+    from main_pipeline import main
+
+    return main(fail_on_drift=args.fail_on_drift)
+
+
+def cmd_score(args):
+    """
+    Prices the book with the saved models, or re-prices cached predictions
+    with new loadings (--cached) without loading any model.
+    """
+    from src.models.pricing import PricingEngine
+
+    pricing = PricingEngine(
+        expense_loading=args.expense_loading, profit_loading=args.profit_loading
+    )
+    if args.cached:
+        pricing.load_predictions(args.predictions)
+    else:
+        from src.features.feature_store import load_features
+
+        builder = load_features(args.data)
+        X, _ = builder.get_probability_data()
+        pricing.predict_expected_loss(X)
+        pricing.save_predictions(args.predictions)
+
+    priced = pricing.compute_premiums()
+    priced.to_csv(args.output)
+    logging.info(f"Premiums written to {args.output}")
+
+
+def cmd_stats(args):
+    from src.data.loader import load_data
+    from src.stats.hypothesis import run_hypothesis_tests
+
+    df = load_data(args.data)
+    print(run_hypothesis_tests(df).to_string())
+
+
+def cmd_dashboard(args):
+    from src.visualization.gen_dashboard import generate_dashboard
+
+    generate_dashboard()
+
+
+def cmd_monitor(args):
+    """
+    Exits 1 on DRIFT, MISSING or QUALITY so cron jobs can act on it.
+    """
+    from src.data.monitor import check_drift, has_drift
+
+    _, report = check_drift(
+        args.data, reference_path=args.reference, report_path=args.output
+    )
+    if report is not None:
+        print(report["Status"].value_counts().to_string())
+    return 1 if has_drift(report) else 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m src.cli", description="Insurance Claims Intelligence"
+    )
+    parser.add_argument(
+        "--profile-imports",
+        action="store_true",
+        help="Print a per-package import time breakdown on exit.",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("pipeline", help="Load -> Preprocess -> Train -> Price.")
+    p.add_argument(
+        "--fail-on-drift",
+        action="store_true",
+        help="Abort before retraining and re-baselining if the drift check fails.",
+    )
+    p.set_defaults(func=cmd_pipeline)
+
+    p = sub.add_parser("score", help="Compute risk-based premiums per policy.")
+    p.add_argument("--data", default=DATA_PATH)
+    p.add_argument("--output", default="reports/premiums.csv")
+    p.add_argument("--predictions", default="models/policy_predictions.pkl")
+    p.add_argument(
+        "--cached",
+        action="store_true",
+        help="Re-price cached predictions instead of re-scoring.",
+    )
+    p.add_argument("--expense-loading", type=float, default=0.15)
+    p.add_argument("--profit-loading", type=float, default=0.05)
+    p.set_defaults(func=cmd_score)
+
+    p = sub.add_parser("stats", help="Run the risk hypothesis tests.")
+    p.add_argument("--data", default=DATA_PATH)
+    p.set_defaults(func=cmd_stats)
+
+    p = sub.add_parser("dashboard", help="Generate dashboard figures.")
+    p.set_defaults(func=cmd_dashboard)
+
+    p = sub.add_parser("monitor", help="Check a data drop for drift and quality.")
+    p.add_argument("--data", default=DATA_PATH)
+    p.add_argument("--reference", default="models/reference_profile.json")
+    p.add_argument("--output", default="reports/drift_report.csv")
+    p.set_defaults(func=cmd_monitor)
+
+    return parser
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    args = build_parser().parse_args(argv)
+
+    if args.profile_imports:
+        return profile_imports([a for a in argv if a != "--profile-imports"])
+
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
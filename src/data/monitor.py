@@ -0,0 +1,559 @@
+import pandas as pd
+import numpy as np
+import logging
+import json
+import math
+import os
+from pandas.api.types import is_numeric_dtype
+
+from src.features.build_features import CURRENT_YEAR, MAX_VEHICLE_AGE
+from src.models.targets import SEGMENT_COLS
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+)
+
+REFERENCE_PROFILE_PATH = "models/reference_profile.json"
+
+# Numeric features additionally sketched within each segment value
+SEGMENT_FEATURES = ["TotalPremium", "TotalClaims", "SumInsured"]
+
+# IDs and period columns change by construction in every drop; never drift-checked
+EXCLUDE_COLS = ["PolicyID", "UnderwrittenCoverID", "TransactionMonth", "Date"]
+
+# Out-of-range values DataBuilder silently replaces with the median VehicleAge
+RANGE_CHECKS = {"RegistrationYear": (CURRENT_YEAR - MAX_VEHICLE_AGE, CURRENT_YEAR)}
+
+# Statuses that fail a drift check (NEW columns are reported but tolerated)
+FAIL_STATUSES = ["DRIFT", "MISSING", "QUALITY"]
+
+# Data-quality limits, as increases over the reference rate. These catch what
+# DataBuilder's imputers and VehicleAge clamp would otherwise fix silently.
+NULL_RATE_DELTA_MAX = 0.05
+INF_RATE_DELTA_MAX = 0.001
+OUT_OF_RANGE_RATE_DELTA_MAX = 0.01
+
+# PSI rule of thumb: < 0.1 stable, 0.1-0.25 moderate shift, > 0.25 drift
+PSI_WARN = 0.1
+PSI_DRIFT = 0.25
+
+# PSI sampling noise grows like n_bins / n; below this many non-null values on
+# either side (e.g. rare VehicleType segments) PSI is reported as LOW_COUNT
+MIN_COUNT = 500
+
+
+class NumericSketch:
+    """
+    Mergeable relative-error quantile sketch (DDSketch-style log buckets)
+    plus null/inf/out-of-range counters. Size grows with the log of the
+    value range, not with the number of rows.
+    """
+
+    kind = "numeric"
+
+    def __init__(self, relative_accuracy=0.01, min_value=1e-9, valid_range=None):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.min_value = min_value
+        self.valid_range = valid_range
+        self.pos = {}
+        self.neg = {}
+        self.zeros = 0
+        self.count = 0
+        self.nulls = 0
+        self.infs = 0
+        self.out_of_range = 0
+
+    def update(self, values):
+        values = pd.to_numeric(pd.Series(values), errors="coerce").to_numpy(float)
+        self.count += len(values)
+
+        nan_mask = np.isnan(values)
+        inf_mask = np.isinf(values)
+        self.nulls += int(nan_mask.sum())
+        self.infs += int(inf_mask.sum())
+        values = values[~(nan_mask | inf_mask)]
+
+        if self.valid_range is not None:
+            low, high = self.valid_range
+            self.out_of_range += int(((values < low) | (values > high)).sum())
+
+        abs_values = np.abs(values)
+        self.zeros += int((abs_values <= self.min_value).sum())
+        self._add(self.pos, values[values > self.min_value])
+        self._add(self.neg, -values[values < -self.min_value])
+
+    def _add(self, store, values):
+        if len(values) == 0:
+            return
+        keys = np.ceil(np.log(values) / math.log(self.gamma)).astype(int)
+        uniq, counts = np.unique(keys, return_counts=True)
+        for k, c in zip(uniq.tolist(), counts.tolist()):
+            store[k] = store.get(k, 0) + c
+
+    def merge(self, other):
+        for store, other_store in ((self.pos, other.pos), (self.neg, other.neg)):
+            for k, c in other_store.items():
+                store[k] = store.get(k, 0) + c
+        self.zeros += other.zeros
+        self.count += other.count
+        self.nulls += other.nulls
+        self.infs += other.infs
+        self.out_of_range += other.out_of_range
+        return self
+
+    def _value(self, key):
+        return 2 * self.gamma**key / (self.gamma + 1)
+
+    def histogram(self):
+        """
+        Returns (values, counts) sorted by value; values are bucket midpoints.
+        """
+        values = [-self._value(k) for k in self.neg] + [0.0] * bool(self.zeros)
+        values += [self._value(k) for k in self.pos]
+        counts = list(self.neg.values()) + [self.zeros] * bool(self.zeros)
+        counts += list(self.pos.values())
+
+        values, counts = np.array(values, dtype=float), np.array(counts, dtype=float)
+        order = np.argsort(values)
+        return values[order], counts[order]
+
+    def cdf(self, points):
+        values, counts = self.histogram()
+        total = counts.sum()
+        if total == 0:
+            return np.zeros(len(points))
+        cum = np.concatenate([[0.0], np.cumsum(counts)])
+        return cum[np.searchsorted(values, points, side="right")] / total
+
+    def quantile(self, q):
+        values, counts = self.histogram()
+        if counts.sum() == 0:
+            return np.nan
+        idx = np.searchsorted(np.cumsum(counts), q * counts.sum())
+        return values[min(idx, len(values) - 1)]
+
+    def to_dict(self):
+        return {
+            "kind": self.kind,
+            "relative_accuracy": self.relative_accuracy,
+            "min_value": self.min_value,
+            "valid_range": self.valid_range,
+            "pos": {str(k): c for k, c in self.pos.items()},
+            "neg": {str(k): c for k, c in self.neg.items()},
+            "zeros": self.zeros,
+            "count": self.count,
+            "nulls": self.nulls,
+            "infs": self.infs,
+            "out_of_range": self.out_of_range,
+        }
+
+    @classmethod
+    def from_dict(cls, d):
+        sketch = cls(d["relative_accuracy"], d["min_value"], d["valid_range"])
+        sketch.pos = {int(k): c for k, c in d["pos"].items()}
+        sketch.neg = {int(k): c for k, c in d["neg"].items()}
+        for field in ("zeros", "count", "nulls", "infs", "out_of_range"):
+            setattr(sketch, field, d[field])
+        return sketch
+
+
+class CategorySketch:
+    """
+    Mergeable Misra-Gries heavy-hitter summary with at most `capacity`
+    counters. Counts are underestimates by at most count / (capacity + 1).
+    """
+
+    kind = "category"
+
+    def __init__(self, capacity=256):
+        self.capacity = capacity
+        self.counters = {}
+        self.count = 0
+        self.nulls = 0
+
+    def update(self, values):
+        values = pd.Series(values)
+        self.count += len(values)
+        self.nulls += int(values.isna().sum())
+
+        counts = values.dropna().astype(str).value_counts()
+        for k, c in counts.items():
+            self.counters[k] = self.counters.get(k, 0) + int(c)
+        self._prune()
+
+    def _prune(self):
+        if len(self.counters) <= self.capacity:
+            return
+        # Subtract the (capacity + 1)-th largest count and drop non-positive counters
+        cut = sorted(self.counters.values(), reverse=True)[self.capacity]
+        self.counters = {k: c - cut for k, c in self.counters.items() if c > cut}
+
+    def merge(self, other):
+        for k, c in other.counters.items():
+            self.counters[k] = self.counters.get(k, 0) + c
+        self.count += other.count
+        self.nulls += other.nulls
+        self._prune()
+        return self
+
+    def frequencies(self):
+        non_null = self.count - self.nulls
+        if non_null == 0:
+            return {}
+        return {k: c / non_null for k, c in self.counters.items()}
+
+    def to_dict(self):
+        return {
+            "kind": self.kind,
+            "capacity": self.capacity,
+            "counters": self.counters,
+            "count": self.count,
+            "nulls": self.nulls,
+        }
+
+    @classmethod
+    def from_dict(cls, d):
+        sketch = cls(d["capacity"])
+        sketch.counters = dict(d["counters"])
+        sketch.count = d["count"]
+        sketch.nulls = d["nulls"]
+        return sketch
+
+
+def _sketch_from_dict(d):
+    if d["kind"] == NumericSketch.kind:
+        return NumericSketch.from_dict(d)
+    return CategorySketch.from_dict(d)
+
+
+class DataProfile:
+    """
+    Per-feature and per-segment sketches of a dataset, built chunk by chunk.
+    Profiles of separate chunks or files can be merged.
+    """
+
+    def __init__(self, segment_cols=None, segment_features=None, kinds=None):
+        self.segment_cols = SEGMENT_COLS if segment_cols is None else segment_cols
+        self.segment_features = (
+            SEGMENT_FEATURES if segment_features is None else segment_features
+        )
+        # Column -> "numeric" / "category"; pinned from a reference profile when
+        # given so the sketch type never depends on read_csv's per-chunk guess
+        self.kinds = dict(kinds or {})
+        self.n_rows = 0
+        self.features = {}
+        # Keyed "<segment col>=<segment value>" -> {feature: sketch}
+        self.segments = {}
+        # Nulls seen before a column's type could be inferred
+        self._pending_nulls = {}
+
+    def _new_sketch(self, name, kind):
+        if kind == "numeric":
+            return NumericSketch(valid_range=RANGE_CHECKS.get(name))
+        return CategorySketch()
+
+    def _create(self, col, kind):
+        sketch = self._new_sketch(col, kind)
+        pending = self._pending_nulls.pop(col, 0)
+        sketch.count += pending
+        sketch.nulls += pending
+        self.features[col] = sketch
+        return sketch
+
+    def update(self, chunk: pd.DataFrame):
+        self.n_rows += len(chunk)
+
+        for col in chunk.columns:
+            if col in EXCLUDE_COLS:
+                continue
+            series = chunk[col]
+            if col not in self.features:
+                kind = self.kinds.get(col)
+                if kind is None:
+                    if series.isna().all():
+                        # An all-null chunk parses as float; defer the decision
+                        self._pending_nulls[col] = (
+                            self._pending_nulls.get(col, 0) + len(series)
+                        )
+                        continue
+                    kind = "numeric" if is_numeric_dtype(series) else "category"
+                    self.kinds[col] = kind
+                self._create(col, kind)
+            self.features[col].update(series)
+
+        seg_features = [c for c in self.segment_features if c in chunk.columns]
+        for seg_col in self.segment_cols:
+            if seg_col not in chunk.columns or not seg_features:
+                continue
+            for seg_val, group in chunk.groupby(seg_col, dropna=False):
+                sketches = self.segments.setdefault(f"{seg_col}={seg_val}", {})
+                for col in seg_features:
+                    if col not in sketches:
+                        sketches[col] = NumericSketch()
+                    sketches[col].update(group[col])
+
+    def finalize(self):
+        """
+        Creates sketches for columns that were null in every chunk seen.
+        """
+        for col in list(self._pending_nulls):
+            self._create(col, self.kinds.get(col, "numeric"))
+        return self
+
+    def merge(self, other):
+        self.n_rows += other.n_rows
+        for col, sketch in other.features.items():
+            self.kinds.setdefault(col, sketch.kind)
+            if col in self.features:
+                self.features[col].merge(sketch)
+            elif col in self._pending_nulls:
+                self._create(col, sketch.kind).merge(sketch)
+            else:
+                self.features[col] = sketch
+        for col, n in other._pending_nulls.items():
+            if col in self.features:
+                self.features[col].count += n
+                self.features[col].nulls += n
+            else:
+                self._pending_nulls[col] = self._pending_nulls.get(col, 0) + n
+        for seg, sketches in other.segments.items():
+            mine = self.segments.setdefault(seg, {})
+            for col, sketch in sketches.items():
+                if col in mine:
+                    mine[col].merge(sketch)
+                else:
+                    mine[col] = sketch
+        return self
+
+    def save(self, filepath):
+        os.makedirs(os.path.dirname(filepath) or ".", exist_ok=True)
+        payload = {
+            "n_rows": self.n_rows,
+            "segment_cols": self.segment_cols,
+            "segment_features": self.segment_features,
+            "features": {c: s.to_dict() for c, s in self.features.items()},
+            "segments": {
+                seg: {c: s.to_dict() for c, s in sketches.items()}
+                for seg, sketches in self.segments.items()
+            },
+        }
+        with open(filepath, "w") as f:
+            json.dump(payload, f)
+        logging.info(f"Data profile saved to {filepath}")
+
+    @classmethod
+    def load(cls, filepath):
+        with open(filepath) as f:
+            payload = json.load(f)
+        profile = cls(payload["segment_cols"], payload["segment_features"])
+        profile.n_rows = payload["n_rows"]
+        profile.features = {
+            c: _sketch_from_dict(d) for c, d in payload["features"].items()
+        }
+        profile.kinds = {c: sk.kind for c, sk in profile.features.items()}
+        profile.segments = {
+            seg: {c: _sketch_from_dict(d) for c, d in sketches.items()}
+            for seg, sketches in payload["segments"].items()
+        }
+        return profile
+
+
+def _detect_sep(filepath):
+    # Mirrors load_data: pipe-delimited first, comma as fallback
+    with open(filepath) as f:
+        header = f.readline()
+    return "|" if "|" in header else ","
+
+
+def profile_file(
+    filepath: str, chunksize: int = 200_000, reference=None, **kwargs
+) -> DataProfile:
+    """
+    Streams a raw data file once and returns its DataProfile.
+    Only one chunk is held in memory at a time. When a reference profile is
+    given, each column's sketch type is taken from it and categorical
+    columns are read as strings, so dtype guessing cannot fake a drift.
+    """
+    kinds = reference.kinds if reference is not None else None
+    profile = DataProfile(kinds=kinds, **kwargs)
+
+    dtype = {c: str for c, k in (kinds or {}).items() if k == CategorySketch.kind}
+    reader = pd.read_csv(
+        filepath,
+        sep=_detect_sep(filepath),
+        chunksize=chunksize,
+        low_memory=False,
+        dtype=dtype,
+        usecols=lambda c: c not in EXCLUDE_COLS,
+    )
+    for chunk in reader:
+        profile.update(chunk)
+    profile.finalize()
+    logging.info(f"Profiled {profile.n_rows} rows from {filepath}")
+    return profile
+
+
+def _psi(expected, actual, eps=1e-4):
+    expected = np.clip(np.asarray(expected, dtype=float), eps, None)
+    actual = np.clip(np.asarray(actual, dtype=float), eps, None)
+    return float(np.sum((actual - expected) * np.log(actual / expected)))
+
+
+def _numeric_drift(ref, new, n_bins=10):
+    """
+    PSI over reference decile bins and KS over the shared bucket grid.
+    """
+    ref_values, ref_counts = ref.histogram()
+    new_values, new_counts = new.histogram()
+    if ref_counts.sum() == 0 or new_counts.sum() == 0:
+        return np.nan, np.nan
+
+    edges = np.unique([ref.quantile(q) for q in np.linspace(0, 1, n_bins + 1)[1:-1]])
+    ref_cdf = np.concatenate([[0.0], ref.cdf(edges), [1.0]])
+    new_cdf = np.concatenate([[0.0], new.cdf(edges), [1.0]])
+    psi = _psi(np.diff(ref_cdf), np.diff(new_cdf))
+
+    grid = np.union1d(ref_values, new_values)
+    ks = float(np.max(np.abs(ref.cdf(grid) - new.cdf(grid))))
+    return psi, ks
+
+
+def _category_drift(ref, new):
+    """
+    PSI over the reference heavy hitters plus an "other" bucket.
+    """
+    ref_freq, new_freq = ref.frequencies(), new.frequencies()
+    if not ref_freq or not new_freq:
+        return np.nan, np.nan
+
+    cats = list(ref_freq)
+    expected = [ref_freq[c] for c in cats]
+    actual = [new_freq.get(c, 0.0) for c in cats]
+    expected.append(max(0.0, 1 - sum(expected)))
+    actual.append(max(0.0, 1 - sum(actual)))
+    return _psi(expected, actual), np.nan
+
+
+def _rate(n, total):
+    return n / total if total else np.nan
+
+
+def _compare_sketches(segment, feature, ref, new):
+    if isinstance(ref, NumericSketch) and isinstance(new, NumericSketch):
+        psi, ks = _numeric_drift(ref, new)
+    elif isinstance(ref, CategorySketch) and isinstance(new, CategorySketch):
+        psi, ks = _category_drift(ref, new)
+    else:
+        # Column changed type between drops
+        psi, ks = np.inf, np.nan
+
+    null_delta = _rate(new.nulls, new.count) - _rate(ref.nulls, ref.count)
+    inf_delta = _rate(getattr(new, "infs", 0), new.count) - _rate(
+        getattr(ref, "infs", 0), ref.count
+    )
+    oor_delta = _rate(getattr(new, "out_of_range", 0), new.count) - _rate(
+        getattr(ref, "out_of_range", 0), ref.count
+    )
+
+    issues = []
+    if null_delta > NULL_RATE_DELTA_MAX:
+        issues.append(f"null rate +{null_delta:.2%}")
+    if inf_delta > INF_RATE_DELTA_MAX:
+        issues.append(f"inf rate +{inf_delta:.2%}")
+    if oor_delta > OUT_OF_RANGE_RATE_DELTA_MAX:
+        issues.append(f"out-of-range rate +{oor_delta:.2%}")
+
+    if min(ref.count - ref.nulls, new.count - new.nulls) < MIN_COUNT:
+        psi, ks = np.nan, np.nan
+        status = "LOW_COUNT"
+    elif np.isnan(psi):
+        status = "N/A"
+    elif psi >= PSI_DRIFT:
+        status = "DRIFT"
+    elif psi >= PSI_WARN:
+        status = "WARN"
+    else:
+        status = "OK"
+    # Rates are judged on all rows (nulls included), so a mostly-null column
+    # still fails even though too few values remain for PSI
+    if issues and min(ref.count, new.count) >= MIN_COUNT and status != "DRIFT":
+        status = "QUALITY"
+
+    return {
+        "Segment": segment,
+        "Feature": feature,
+        "PSI": psi,
+        "KS": ks,
+        "NullRate_Ref": _rate(ref.nulls, ref.count),
+        "NullRate_New": _rate(new.nulls, new.count),
+        "NullRate_Delta": null_delta,
+        "InfRate_New": _rate(getattr(new, "infs", 0), new.count),
+        "OutOfRangeRate_New": _rate(getattr(new, "out_of_range", 0), new.count),
+        "Issues": "; ".join(issues),
+        "Status": status,
+    }
+
+
+def compare_profiles(reference: DataProfile, new: DataProfile) -> pd.DataFrame:
+    """
+    Computes drift and data-quality metrics of `new` against `reference`,
+    for every feature overall and for each segment's monitored features.
+    """
+    rows = []
+    for col, ref_sketch in reference.features.items():
+        if col in EXCLUDE_COLS:
+            continue
+        if col not in new.features:
+            rows.append({"Segment": "ALL", "Feature": col, "Status": "MISSING"})
+            continue
+        rows.append(_compare_sketches("ALL", col, ref_sketch, new.features[col]))
+
+    for col in sorted(new.features.keys() - reference.features.keys()):
+        rows.append({"Segment": "ALL", "Feature": col, "Status": "NEW"})
+
+    for seg, ref_sketches in reference.segments.items():
+        new_sketches = new.segments.get(seg, {})
+        for col, ref_sketch in ref_sketches.items():
+            if col in new_sketches:
+                rows.append(_compare_sketches(seg, col, ref_sketch, new_sketches[col]))
+
+    return pd.DataFrame(rows)
+
+
+def has_drift(report) -> bool:
+    """
+    True when a drift report contains any failing check.
+    """
+    return report is not None and bool(report["Status"].isin(FAIL_STATUSES).any())
+
+
+def check_drift(filepath, reference_path=REFERENCE_PROFILE_PATH, report_path=None):
+    """
+    Profiles a new data drop and compares it with the stored training profile.
+    Returns (profile, report); report is None when no reference exists yet.
+    """
+    if not os.path.exists(reference_path):
+        logging.warning(f"No reference profile at {reference_path}. Skipping check.")
+        return profile_file(filepath), None
+
+    reference = DataProfile.load(reference_path)
+    profile = profile_file(filepath, reference=reference)
+    report = compare_profiles(reference, profile)
+    flagged = report[report["Status"].isin(FAIL_STATUSES + ["NEW"])]
+    for _, row in flagged.iterrows():
+        detail = row.get("Issues")
+        detail = f": {detail}" if isinstance(detail, str) and detail else ""
+        logging.warning(
+            f"[{row['Status']}] {row['Segment']} / {row['Feature']}{detail}"
+        )
+    logging.info(
+        f"Drift check: {len(flagged)} of {len(report)} feature/segment checks flagged."
+    )
+
+    if report_path:
+        os.makedirs(os.path.dirname(report_path) or ".", exist_ok=True)
+        report.to_csv(report_path, index=False)
+        logging.info(f"Drift report saved to {report_path}")
+    return profile, report
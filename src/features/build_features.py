@@ -1,8 +1,5 @@
 import pandas as pd
 import numpy as np
-from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import LabelEncoder
-from sklearn.impute import SimpleImputer
 import logging
 
 # Configure logging
@@ -10,14 +7,20 @@ logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
 )
 
+# VehicleAge = CURRENT_YEAR - RegistrationYear; ages outside 0..MAX_VEHICLE_AGE
+# are treated as data errors and replaced with the median
+CURRENT_YEAR = 2025
+MAX_VEHICLE_AGE = 50
+
 
 class DataBuilder:
     """
     A class to handle data preprocessing, imputation, encoding, and splitting for insurance data.
     """
 
-    def __init__(self, df: pd.DataFrame):
-        self.df = df.copy()
+    def __init__(self, df: pd.DataFrame, copy: bool = True):
+        # copy=False keeps a read-only (e.g. memory-mapped) frame shared
+        self.df = df.copy() if copy else df
         self.encoders = {}
         self.imputers = {}
 
@@ -38,6 +41,8 @@ class DataBuilder:
         - Numerical: Median
         - Categorical: Mode
         """
+        from sklearn.impute import SimpleImputer
+
         logging.info("Handling missing values...")
 
         # Replace infinite values with NaN first
@@ -86,16 +91,20 @@ class DataBuilder:
 
         # 2. Vehicle Age (Current Year - RegistrationYear)
         if "RegistrationYear" in self.df.columns:
-            current_year = 2025  # Assuming current context or max year in data
             # Clean RegistrationYear (replace placeholders like 9999)
             self.df["RegistrationYear"] = pd.to_numeric(
                 self.df["RegistrationYear"], errors="coerce"
             )
-            self.df["VehicleAge"] = current_year - self.df["RegistrationYear"]
+            self.df["VehicleAge"] = CURRENT_YEAR - self.df["RegistrationYear"]
             # Handle anomalous ages
-            self.df.loc[
-                (self.df["VehicleAge"] < 0) | (self.df["VehicleAge"] > 50), "VehicleAge"
-            ] = self.df["VehicleAge"].median()
+            anomalous = (self.df["VehicleAge"] < 0) | (
+                self.df["VehicleAge"] > MAX_VEHICLE_AGE
+            )
+            if anomalous.any():
+                logging.warning(
+                    f"Replacing {anomalous.sum()} anomalous VehicleAge values with the median."
+                )
+            self.df.loc[anomalous, "VehicleAge"] = self.df["VehicleAge"].median()
 
         # 3. Premium to SumInsured Ratio (Proxy for Risk Rate)
         if "TotalPremium" in self.df.columns and "SumInsured" in self.df.columns:
@@ -108,6 +117,8 @@ class DataBuilder:
         """
         Encodes categorical columns using Label Encoding (suitable for Trees/RF/XGB).
         """
+        from sklearn.preprocessing import LabelEncoder
+
         logging.info("Encoding categorical variables...")
         cat_cols = self.df.select_dtypes(include=["object", "category"]).columns
 
@@ -155,8 +166,42 @@ class DataBuilder:
 
         return X, y
 
+    def get_target_data(
+        self, target, task="regression", query=None, group_by=None, agg="sum"
+    ):
+        """
+        Returns X, y for a registry-declared target (see src/models/targets.py).
+        target/query are pandas eval()/query() expressions over self.df.
+        Unknown registry keys raise TypeError rather than being ignored.
+        """
+        if task not in ("regression", "classification"):
+            raise ValueError(f"Unknown task '{task}'.")
+
+        data = self.df.query(query) if query else self.df
+        y = data.eval(target).replace([np.inf, -np.inf], np.nan)
+        valid = y.notna()
+        data, y = data[valid], y[valid]
+
+        X = data.drop(columns=["TotalClaims", "IsClaim"])  # Drop targets
+
+        # Drop non-predictive ID columns
+        cols_to_drop = [c for c in ["PolicyID", "Date"] if c in X.columns]
+        X = X.drop(columns=cols_to_drop)
+
+        if group_by:
+            # Segment-level target: average features, aggregate target, keep exposure
+            keys = [data[c] for c in group_by]
+            y = y.groupby(keys).agg(agg)
+            X = X.drop(columns=group_by).groupby(keys).mean()
+            X["Policies"] = data.groupby(keys).size()
+            X, y = X.reset_index(), y.reset_index(drop=True)
+
+        return X, y
+
     def split_data(self, X, y, test_size=0.2, random_state=42):
         """
         Wrapper for train_test_split.
         """
+        from sklearn.model_selection import train_test_split
+
         return train_test_split(X, y, test_size=test_size, random_state=random_state)
@@ -0,0 +1,197 @@
+import pandas as pd
+import numpy as np
+import logging
+import hashlib
+import json
+import joblib
+import os
+import shutil
+import tempfile
+import time
+import uuid
+
+from src.data.loader import load_data
+from src.features.build_features import DataBuilder
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+)
+
+# Bump when DataBuilder preprocessing changes so stale stores are rebuilt
+FEATURE_VERSION = 1
+STORE_DIR = "data/processed/feature_store"
+# Temporary build directories older than this are assumed abandoned
+TMP_MAX_AGE_SECONDS = 24 * 3600
+
+
+def _source_fingerprint(filepath):
+    """
+    Cheap fingerprint of the raw file (path, size, mtime) plus the feature version.
+    """
+    stat = os.stat(filepath)
+    key = f"{os.path.abspath(filepath)}|{stat.st_size}|{stat.st_mtime_ns}|{FEATURE_VERSION}"
+    return hashlib.sha1(key.encode()).hexdigest()[:12]
+
+
+class FeatureStore:
+    """
+    Versioned on-disk store of the preprocessed feature matrix.
+    Each column is a .npy file opened with mmap_mode='r', so every process
+    on the host shares the same OS page cache instead of its own copy.
+    """
+
+    def __init__(self, store_dir=STORE_DIR):
+        self.store_dir = store_dir
+
+    def version_dir(self, data_path):
+        return os.path.join(self.store_dir, f"v{_source_fingerprint(data_path)}")
+
+    def exists(self, data_path):
+        return os.path.exists(
+            os.path.join(self.version_dir(data_path), "metadata.json")
+        )
+
+    def write(self, builder, data_path, replace=False):
+        """
+        Writes a preprocessed DataBuilder's frame and encoders to the store.
+
+        Files are written to a temporary sibling directory which is then
+        renamed into place, so readers never see a partial version and files
+        other processes have memory-mapped are never truncated. An existing
+        version is reused unless replace=True, in which case it is renamed
+        aside (open mmaps stay valid) rather than overwritten.
+        """
+        out_dir = self.version_dir(data_path)
+        if self.exists(data_path) and not replace:
+            logging.info(f"Feature store version {out_dir} already exists. Reusing.")
+            return out_dir
+
+        df = builder.df
+        unsupported = df.select_dtypes(exclude=[np.number, "bool"]).columns.tolist()
+        if unsupported:
+            raise ValueError(f"Non-numeric columns cannot be stored: {unsupported}")
+
+        os.makedirs(self.store_dir, exist_ok=True)
+        tmp_dir = tempfile.mkdtemp(
+            prefix=f"{os.path.basename(out_dir)}.tmp-", dir=self.store_dir
+        )
+        try:
+            self._write_files(df, builder.encoders, data_path, tmp_dir)
+
+            stale_dir = None
+            # Only move aside on an explicit rebuild or an incomplete directory
+            # left by an older writer. A complete version published by another
+            # process since our exists() check is left alone (see below).
+            complete = os.path.exists(os.path.join(out_dir, "metadata.json"))
+            if os.path.exists(out_dir) and (replace or not complete):
+                stale_dir = f"{out_dir}.stale-{uuid.uuid4().hex}"
+                os.rename(out_dir, stale_dir)
+            try:
+                os.replace(tmp_dir, out_dir)
+            except OSError:
+                # Another process published this version first; use theirs
+                logging.info(f"Feature store version {out_dir} built concurrently.")
+                return out_dir
+            finally:
+                if stale_dir:
+                    shutil.rmtree(stale_dir, ignore_errors=True)
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+        logging.info(f"Feature store written to {out_dir} ({len(df)} rows)")
+        self._prune(out_dir, os.path.abspath(data_path))
+        return out_dir
+
+    def _prune(self, current_dir, source):
+        """
+        Removes superseded versions of the same raw file, leftover stale
+        directories and abandoned temporary builds. Versions built from other
+        raw files are kept. Unlinking files that are still memory-mapped is
+        safe; the pages stay valid until the reader unmaps them.
+        """
+        now = time.time()
+        for name in os.listdir(self.store_dir):
+            path = os.path.join(self.store_dir, name)
+            if path == current_dir or not os.path.isdir(path):
+                continue
+
+            if ".stale-" in name:
+                remove = True
+            elif ".tmp-" in name:
+                # May belong to a writer that is still running
+                remove = now - os.path.getmtime(path) > TMP_MAX_AGE_SECONDS
+            elif name.startswith("v"):
+                try:
+                    with open(os.path.join(path, "metadata.json")) as f:
+                        remove = json.load(f).get("source") == source
+                except (OSError, ValueError):
+                    remove = True  # incomplete directory from an older writer
+            else:
+                remove = False
+
+            if remove:
+                logging.info(f"Pruning old feature store directory {path}")
+                shutil.rmtree(path, ignore_errors=True)
+
+    def _write_files(self, df, encoders, data_path, out_dir):
+        cols_dir = os.path.join(out_dir, "columns")
+        os.makedirs(cols_dir)
+
+        columns = []
+        for i, col in enumerate(df.columns):
+            # Positional file names avoid escaping arbitrary column names
+            filename = f"{i:04d}.npy"
+            np.save(os.path.join(cols_dir, filename), df[col].to_numpy())
+            columns.append({"name": col, "file": filename, "dtype": str(df[col].dtype)})
+
+        joblib.dump(encoders, os.path.join(out_dir, "encoders.pkl"))
+
+        metadata = {
+            "feature_version": FEATURE_VERSION,
+            "source": os.path.abspath(data_path),
+            "n_rows": len(df),
+            "columns": columns,
+        }
+        with open(os.path.join(out_dir, "metadata.json"), "w") as f:
+            json.dump(metadata, f, indent=2)
+
+    def open(self, data_path, columns=None):
+        """
+        Opens a stored version zero-copy.
+        Returns (df, encoders); df columns are read-only memory-mapped arrays.
+        """
+        out_dir = self.version_dir(data_path)
+        with open(os.path.join(out_dir, "metadata.json")) as f:
+            metadata = json.load(f)
+
+        arrays = {}
+        for entry in metadata["columns"]:
+            if columns is not None and entry["name"] not in columns:
+                continue
+            path = os.path.join(out_dir, "columns", entry["file"])
+            arrays[entry["name"]] = np.load(path, mmap_mode="r")
+
+        df = pd.DataFrame(arrays, copy=False)
+        encoders = joblib.load(os.path.join(out_dir, "encoders.pkl"))
+        return df, encoders
+
+
+def load_features(data_path, store_dir=STORE_DIR, rebuild=False):
+    """
+    Returns a preprocessed DataBuilder, building the feature store on first use.
+    Later calls (from any process) reuse the memory-mapped store.
+    """
+    store = FeatureStore(store_dir)
+
+    if rebuild or not store.exists(data_path):
+        logging.info("Feature store miss. Building features from raw data...")
+        builder = DataBuilder(load_data(data_path))
+        builder.preprocess()
+        store.write(builder, data_path, replace=rebuild)
+
+    df, encoders = store.open(data_path)
+    builder = DataBuilder(df, copy=False)
+    builder.encoders = encoders
+    logging.info(f"Loaded features from store ({len(df)} rows)")
+    return builder
@@ -0,0 +1,189 @@
+import pandas as pd
+import numpy as np
+import logging
+import joblib
+from joblib import Parallel, delayed
+import os
+
+from src.models.targets import SEGMENT_COLS
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+)
+
+# Per-process cache so each worker unpickles the models once, not once per chunk.
+# Keyed on mtime too: loky reuses workers, so a retrained model must not be masked.
+_MODEL_CACHE = {}
+
+
+def _load_cached(filepath):
+    key = (filepath, os.stat(filepath).st_mtime_ns)
+    if key not in _MODEL_CACHE:
+        _MODEL_CACHE[key] = joblib.load(filepath)
+    return _MODEL_CACHE[key]
+
+
+def claim_frequency(model, X):
+    """
+    Converts a class-balanced classifier's predict_proba into a claim frequency.
+
+    Balanced training shifts the prior from the true claim rate to
+    weighted_base_rate_ (0.5), so the odds are rescaled back:
+        odds_true = odds_model * odds(train_base_rate_) / odds(weighted_base_rate_)
+    """
+    base = getattr(model, "train_base_rate_", None)
+    weighted = getattr(model, "weighted_base_rate_", None)
+    if base is None or weighted is None:
+        raise ValueError(
+            "Probability model has no recorded base rate; retrain it with ModelTrainer."
+        )
+
+    prob = np.clip(model.predict_proba(X)[:, 1], 1e-12, 1 - 1e-12)
+    odds = prob / (1 - prob) * (base / (1 - base)) / (weighted / (1 - weighted))
+    return odds / (1 + odds)
+
+
+def _predict_chunk(severity_path, probability_path, X_chunk):
+    """
+    Scores one chunk of the book. Runs inside a worker process.
+    """
+    sev_model = _load_cached(severity_path)
+    prob_model = _load_cached(probability_path)
+
+    prob = claim_frequency(prob_model, X_chunk)
+    # Severity model is trained on claims > 0 only; negative predictions are meaningless
+    sev = np.clip(sev_model.predict(X_chunk), 0, None)
+
+    return pd.DataFrame(
+        {
+            "ClaimProbability": prob,
+            "ClaimSeverity": sev,
+            "ExpectedLoss": prob * sev,
+        },
+        index=X_chunk.index,
+    )
+
+
+class PricingEngine:
+    """
+    Combines the Probability and Severity models into risk-based premiums.
+    Premium = P(Claim) * Severity * (1 + expense_loading + profit_loading)
+    where P(Claim) is the class-balanced probability mapped back to the
+    training claim rate (see claim_frequency).
+    """
+
+    def __init__(
+        self,
+        severity_path="models/severity_model.pkl",
+        probability_path="models/probability_model.pkl",
+        expense_loading=0.15,
+        profit_loading=0.05,
+        chunk_size=100_000,
+        n_jobs=-1,
+    ):
+        self.severity_path = severity_path
+        self.probability_path = probability_path
+        self.expense_loading = expense_loading
+        self.profit_loading = profit_loading
+        self.chunk_size = chunk_size
+        self.n_jobs = n_jobs
+        self.predictions = None
+
+    def predict_expected_loss(self, X):
+        """
+        Predicts claim probability, severity and expected loss for every policy.
+        The book is split into chunks and scored in parallel worker processes.
+        """
+        for path in (self.severity_path, self.probability_path):
+            if not os.path.exists(path):
+                raise FileNotFoundError(f"Model file not found at {path}")
+
+        n_chunks = max(1, int(np.ceil(len(X) / self.chunk_size)))
+        logging.info(f"Scoring {len(X)} policies in {n_chunks} chunks...")
+
+        chunks = (
+            X.iloc[i : i + self.chunk_size] for i in range(0, len(X), self.chunk_size)
+        )
+        parts = Parallel(n_jobs=self.n_jobs)(
+            delayed(_predict_chunk)(self.severity_path, self.probability_path, chunk)
+            for chunk in chunks
+        )
+
+        self.predictions = pd.concat(parts) if parts else pd.DataFrame()
+        return self.predictions
+
+    def save_predictions(self, filepath):
+        """
+        Caches per-policy predictions so loadings can be changed without re-scoring.
+        """
+        if self.predictions is None:
+            logging.error("No predictions to save. Run predict_expected_loss first.")
+            return
+        os.makedirs(os.path.dirname(filepath) or ".", exist_ok=True)
+        self.predictions.to_pickle(filepath)
+        logging.info(f"Predictions cached to {filepath}")
+
+    def load_predictions(self, filepath):
+        self.predictions = pd.read_pickle(filepath)
+        logging.info(f"Loaded cached predictions from {filepath}")
+        return self.predictions
+
+    def compute_premiums(self, expense_loading=None, profit_loading=None):
+        """
+        Applies loadings to the cached expected losses. Pass loadings to run a
+        what-if scenario; the engine's defaults are used otherwise.
+        """
+        if self.predictions is None:
+            raise ValueError("No predictions available. Run predict_expected_loss first.")
+
+        expense = self.expense_loading if expense_loading is None else expense_loading
+        profit = self.profit_loading if profit_loading is None else profit_loading
+
+        priced = self.predictions.copy()
+        priced["RiskPremium"] = priced["ExpectedLoss"] * (1 + expense + profit)
+        return priced
+
+    def build_rate_tables(self, priced, segments_df, encoders=None):
+        """
+        Aggregates priced policies into one rate table per segment column.
+
+        segments_df holds the segment columns (Province, VehicleType, CoverType)
+        aligned on the same index as the predictions. If the columns are label
+        encoded, pass DataBuilder.encoders to restore the original labels.
+        """
+        encoders = encoders or {}
+        tables = {}
+
+        for col in SEGMENT_COLS:
+            if col not in segments_df.columns:
+                logging.warning(f"Segment column {col} missing. Skipping.")
+                continue
+
+            seg = segments_df.loc[priced.index, col]
+            if col in encoders:
+                seg = pd.Series(
+                    encoders[col].inverse_transform(seg.astype(int)), index=seg.index
+                )
+
+            tables[col] = (
+                priced.groupby(seg.rename(col))
+                .agg(
+                    Policies=("RiskPremium", "size"),
+                    AvgClaimProbability=("ClaimProbability", "mean"),
+                    AvgClaimSeverity=("ClaimSeverity", "mean"),
+                    AvgExpectedLoss=("ExpectedLoss", "mean"),
+                    AvgRiskPremium=("RiskPremium", "mean"),
+                    TotalRiskPremium=("RiskPremium", "sum"),
+                )
+                .sort_values("AvgRiskPremium", ascending=False)
+            )
+
+        return tables
+
+    def write_rate_tables(self, tables, output_dir="reports/rate_tables"):
+        os.makedirs(output_dir, exist_ok=True)
+        for col, table in tables.items():
+            path = os.path.join(output_dir, f"rate_table_{col}.csv")
+            table.to_csv(path)
+            logging.info(f"Rate table saved to {path}")
@@ -0,0 +1,41 @@
+"""
+Target registry for ModelTrainer.
+
+Each entry declares how to derive a target from the preprocessed feature matrix:
+- task:     "regression" or "classification"
+- target:   pandas eval() expression over DataBuilder.df columns
+- query:    optional pandas query() expression selecting training rows
+- group_by: optional segment columns; rows are aggregated per segment
+            (features averaged, target combined with `agg`) before training
+
+Adding a target is a config change only; all targets share one data load.
+"""
+
+SEGMENT_COLS = ["Province", "VehicleType", "CoverType"]
+
+TARGETS = {
+    "Severity": {
+        "task": "regression",
+        "target": "TotalClaims",
+        "query": "TotalClaims > 0",
+    },
+    "Probability": {
+        "task": "classification",
+        "target": "IsClaim",
+    },
+    "Margin": {
+        "task": "regression",
+        "target": "TotalPremium - TotalClaims",
+    },
+    "LossRatio": {
+        "task": "regression",
+        "target": "TotalClaims / TotalPremium",
+        "query": "TotalPremium > 0",
+    },
+    "ClaimCount": {
+        "task": "regression",
+        "target": "IsClaim",
+        "group_by": SEGMENT_COLS,
+        "agg": "sum",
+    },
+}
@@ -1,26 +1,28 @@
-import pandas as pd
-import numpy as np
 import logging
-from sklearn.linear_model import LinearRegression, LogisticRegression
-from sklearn.ensemble import RandomForestRegressor, RandomForestClassifier
-from sklearn.metrics import (
-    mean_squared_error,
-    r2_score,
-    accuracy_score,
-    classification_report,
-    f1_score,
-)
-import joblib
 import os
+from collections import OrderedDict
+from collections.abc import Mapping
+from functools import lru_cache
+
+from src.models.targets import TARGETS
+
+# sklearn, XGBoost, joblib and pandas are imported inside the methods that use
+# them so that importing this module (e.g. for scoring or --help) stays cheap.
+
+
+@lru_cache(maxsize=None)
+def xgb_available():
+    """
+    Checks for XGBoost on first use instead of at import time.
+    """
+    try:
+        import xgboost  # noqa: F401
 
-# Try importing XGBoost
-try:
-    from xgboost import XGBRegressor, XGBClassifier
+        return True
+    except ImportError:
+        logging.warning("XGBoost not installed. Skipping XGB models.")
+        return False
 
-    XGB_AVAILABLE = True
-except ImportError:
-    XGB_AVAILABLE = False
-    print("XGBoost not installed. Skipping XGB models.")
 
 # Configure logging
 logging.basicConfig(
@@ -28,89 +30,203 @@ logging.basicConfig(
 )
 
 
+class LazyModelStore(Mapping):
+    """
+    Dict-like view of trained models backed by joblib files on disk.
+    Models are written as soon as they are added and loaded on access,
+    keeping at most `max_loaded` estimators in memory. Models already saved
+    in `model_dir` as <name>.pkl (optionally only names starting with one of
+    `prefixes`) are available without retraining.
+    """
+
+    def __init__(self, model_dir="models", max_loaded=1, prefixes=None):
+        self.model_dir = model_dir
+        self.max_loaded = max_loaded
+        self.paths = {}
+        self._loaded = OrderedDict()
+
+        if os.path.isdir(model_dir):
+            for filename in sorted(os.listdir(model_dir)):
+                name, ext = os.path.splitext(filename)
+                if ext != ".pkl":
+                    continue
+                if prefixes is not None and not name.startswith(
+                    tuple(f"{p}_" for p in prefixes)
+                ):
+                    continue
+                self.paths[name] = os.path.join(model_dir, filename)
+
+    def add(self, name, model):
+        import joblib
+
+        os.makedirs(self.model_dir, exist_ok=True)
+        path = os.path.join(self.model_dir, f"{name}.pkl")
+        joblib.dump(model, path)
+        self.paths[name] = path
+        self._loaded.pop(name, None)
+        logging.info(f"Model {name} saved to {path}")
+
+    def __getitem__(self, name):
+        if name in self._loaded:
+            self._loaded.move_to_end(name)
+            return self._loaded[name]
+        if name not in self.paths:
+            raise KeyError(name)
+
+        import joblib
+
+        model = joblib.load(self.paths[name])
+        self._loaded[name] = model
+        while len(self._loaded) > self.max_loaded:
+            self._loaded.popitem(last=False)
+        return model
+
+    def __contains__(self, name):
+        # Membership must not trigger a load
+        return name in self.paths
+
+    def __iter__(self):
+        return iter(self.paths)
+
+    def __len__(self):
+        return len(self.paths)
+
+
 class ModelTrainer:
     """
-    Class to train and evaluate Severity and Probability models.
+    Class to train and evaluate models for every target in the registry
+    (see src/models/targets.py). Trained models are saved to disk and evicted.
     """
 
-    def __init__(self):
-        self.models = {}
+    def __init__(self, model_dir="models", targets=None):
         self.results = {}
+        self.targets = TARGETS if targets is None else targets
+        # Only <Target>_<Model>.pkl files; skips e.g. severity_model.pkl
+        self.models = LazyModelStore(model_dir, prefixes=self.targets)
+        # Names trained in this run; self.models may also hold older files
+        self.trained = []
 
-    def train_severity_models(self, X_train, X_test, y_train, y_test):
+    def train_all(self, builder, targets=None):
         """
-        Trains Regression models for Claim Severity.
-        Target: TotalClaims
+        Trains every registered target (or the given subset) from one
+        preprocessed DataBuilder, so no target triggers another data load.
+        """
+        for name in targets or self.targets:
+            spec = self.targets[name]
+            logging.info(f"--- Target: {name} ---")
+            X, y = builder.get_target_data(**spec)
+            X_train, X_test, y_train, y_test = builder.split_data(X, y)
+            self.train_target(name, spec["task"], X_train, X_test, y_train, y_test)
+
+    def train_target(self, name, task, X_train, X_test, y_train, y_test):
         """
-        logging.info("Training Severity Models (Regression)...")
+        Fits, evaluates and saves each candidate estimator in turn.
+        """
+        logging.info(f"Training {name} Models ({task})...")
+        evaluate = (
+            self._evaluate_classification
+            if task == "classification"
+            else self._evaluate_regression
+        )
 
-        # 1. Linear Regression (Baseline)
-        lr = LinearRegression()
-        lr.fit(X_train, y_train)
-        self._evaluate_regression(lr, X_test, y_test, "LinearRegression")
-        self.models["Severity_LR"] = lr
+        for suffix, model in self._build_estimators(task, y_train):
+            model.fit(X_train, y_train)
+            if task == "classification":
+                # All classifiers are class-balanced, i.e. trained as if the
+                # claim rate were 50%. Record both rates so scorers can map
+                # predict_proba back to the true frequency.
+                model.train_base_rate_ = float((y_train == 1).mean())
+                model.weighted_base_rate_ = 0.5
+            evaluate(model, X_test, y_test, f"{name}_{suffix}")
+            self.models.add(f"{name}_{suffix}", model)
+            self.trained.append(f"{name}_{suffix}")
+            del model
 
-        # 2. Random Forest
-        rf = RandomForestRegressor(n_estimators=100, random_state=42, n_jobs=-1)
-        rf.fit(X_train, y_train)
-        self._evaluate_regression(rf, X_test, y_test, "RandomForest_Reg")
-        self.models["Severity_RF"] = rf
+    def best_trained(self, target, preference=("XGB", "RF", "LR")):
+        """
+        Returns the preferred model name for `target` trained in this run,
+        ignoring files left in model_dir by earlier runs.
+        """
+        for suffix in preference:
+            if f"{target}_{suffix}" in self.trained:
+                return f"{target}_{suffix}"
+        raise KeyError(f"No {target} model was trained in this run.")
 
-        # 3. XGBoost
-        if XGB_AVAILABLE:
-            xgb = XGBRegressor(
-                n_estimators=100, learning_rate=0.1, random_state=42, n_jobs=-1
-            )
-            xgb.fit(X_train, y_train)
-            self._evaluate_regression(xgb, X_test, y_test, "XGBoost_Reg")
-            self.models["Severity_XGB"] = xgb
+    def train_severity_models(self, X_train, X_test, y_train, y_test):
+        """
+        Trains Regression models for Claim Severity.
+        Target: TotalClaims
+        """
+        self.train_target("Severity", "regression", X_train, X_test, y_train, y_test)
 
     def train_probability_models(self, X_train, X_test, y_train, y_test):
         """
         Trains Classification models for Claim Probability.
         Target: IsClaim
         """
-        logging.info("Training Probability Models (Classification)...")
+        self.train_target(
+            "Probability", "classification", X_train, X_test, y_train, y_test
+        )
+
+    def _build_estimators(self, task, y_train):
+        """
+        Yields (suffix, estimator) pairs one at a time so only one is alive.
+        """
+        from sklearn.linear_model import LinearRegression, LogisticRegression
+        from sklearn.ensemble import RandomForestRegressor, RandomForestClassifier
 
-        # Calculate scale_pos_weight for XGBoost (num_negative / num_positive)
-        # Check if we have positive cases in train set to avoid div by zero
-        num_pos = (y_train == 1).sum()
-        num_neg = (y_train == 0).sum()
-        scale_pos_weight = num_neg / num_pos if num_pos > 0 else 1.0
+        if task == "classification":
+            # Calculate scale_pos_weight for XGBoost (num_negative / num_positive)
+            # Check if we have positive cases in train set to avoid div by zero
+            num_pos = (y_train == 1).sum()
+            num_neg = (y_train == 0).sum()
+            scale_pos_weight = num_neg / num_pos if num_pos > 0 else 1.0
 
-        # 1. Logistic Regression (Baseline) - Balanced features
-        lr = LogisticRegression(max_iter=1000, class_weight="balanced")
-        lr.fit(X_train, y_train)
-        self._evaluate_classification(lr, X_test, y_test, "LogisticRegression")
-        self.models["Probability_LR"] = lr
+            # 1. Logistic Regression (Baseline) - Balanced features
+            yield "LR", LogisticRegression(max_iter=1000, class_weight="balanced")
 
-        # 2. Random Forest - Balanced features
-        rf = RandomForestClassifier(
-            n_estimators=100, random_state=42, n_jobs=-1, class_weight="balanced"
-        )
-        rf.fit(X_train, y_train)
-        self._evaluate_classification(rf, X_test, y_test, "RandomForest_Clf")
-        self.models["Probability_RF"] = rf
-
-        # 3. XGBoost - Scaled weight
-        if XGB_AVAILABLE:
-            xgb = XGBClassifier(
-                n_estimators=100,
-                learning_rate=0.1,
-                use_label_encoder=False,
-                eval_metric="logloss",
-                random_state=42,
-                n_jobs=-1,
-                scale_pos_weight=scale_pos_weight,
+            # 2. Random Forest - Balanced features
+            yield "RF", RandomForestClassifier(
+                n_estimators=100, random_state=42, n_jobs=-1, class_weight="balanced"
+            )
+
+            # 3. XGBoost - Scaled weight
+            if xgb_available():
+                from xgboost import XGBClassifier
+
+                yield "XGB", XGBClassifier(
+                    n_estimators=100,
+                    learning_rate=0.1,
+                    use_label_encoder=False,
+                    eval_metric="logloss",
+                    random_state=42,
+                    n_jobs=-1,
+                    scale_pos_weight=scale_pos_weight,
+                )
+        else:
+            # 1. Linear Regression (Baseline)
+            yield "LR", LinearRegression()
+
+            # 2. Random Forest
+            yield "RF", RandomForestRegressor(
+                n_estimators=100, random_state=42, n_jobs=-1
             )
-            xgb.fit(X_train, y_train)
-            self._evaluate_classification(xgb, X_test, y_test, "XGBoost_Clf")
-            self.models["Probability_XGB"] = xgb
+
+            # 3. XGBoost
+            if xgb_available():
+                from xgboost import XGBRegressor
+
+                yield "XGB", XGBRegressor(
+                    n_estimators=100, learning_rate=0.1, random_state=42, n_jobs=-1
+                )
 
     def _evaluate_regression(self, model, X_test, y_test, name):
         """
         Calculates RMSE and R2 for regression models.
         """
+        import numpy as np
+        from sklearn.metrics import mean_squared_error, r2_score
+
         preds = model.predict(X_test)
         rmse = np.sqrt(mean_squared_error(y_test, preds))
         r2 = r2_score(y_test, preds)
@@ -122,6 +238,8 @@ class ModelTrainer:
         """
         Calculates Accuracy and F1 for classification models.
         """
+        from sklearn.metrics import accuracy_score, f1_score
+
         preds = model.predict(X_test)
         acc = accuracy_score(y_test, preds)
         f1 = f1_score(y_test, preds)
@@ -130,9 +248,13 @@ class ModelTrainer:
         self.results[name] = {"Accuracy": acc, "F1": f1}
 
     def get_results(self):
+        import pandas as pd
+
         return pd.DataFrame(self.results).T
 
     def save_model(self, name, filepath):
+        import joblib
+
         if name in self.models:
             joblib.dump(self.models[name], filepath)
             logging.info(f"Model saved to {filepath}")
@@ -68,3 +68,30 @@ def check_anova(df: pd.DataFrame, group_col: str, value_col: str):
         interp = "Fail to Reject Null: No significant difference across groups."
 
     return p_val, interp
+
+
+def run_hypothesis_tests(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Runs the standard risk hypothesis tests (see Task 3 notebook) on raw data.
+
+    Returns:
+        DataFrame with one row per test: Test, P-Value, Interpretation
+    """
+    df = df.copy()
+    df["HasClaim"] = (df["TotalClaims"] > 0).astype(int)
+    df["Margin"] = df["TotalPremium"] - df["TotalClaims"]
+
+    rows = []
+    if "Province" in df.columns:
+        p_val, _, interp = check_chi2_independence(df, "Province", "HasClaim")
+        rows.append(("Claim Frequency by Province (Chi2)", p_val, interp))
+    if "PostalCode" in df.columns:
+        p_val, interp = check_anova(df, "PostalCode", "TotalClaims")
+        rows.append(("Claim Severity by PostalCode (ANOVA)", p_val, interp))
+        p_val, interp = check_anova(df, "PostalCode", "Margin")
+        rows.append(("Margin by PostalCode (ANOVA)", p_val, interp))
+    if "Gender" in df.columns:
+        p_val, interp = check_ttest_means(df, "Gender", "TotalClaims", "Male", "Female")
+        rows.append(("Claim Severity by Gender (T-Test)", p_val, interp))
+
+    return pd.DataFrame(rows, columns=["Test", "P-Value", "Interpretation"])
@@ -1,17 +1,11 @@
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 import os
 import sys
 import logging
-import joblib
 
 # Add project root to path
 sys.path.append(os.path.abspath(os.path.join(os.getcwd(), ".")))
 
-from src.data.loader import load_data
-from src.features.build_features import DataBuilder
+from src.features.feature_store import load_features
 
 # Configure logging
 logging.basicConfig(
@@ -26,10 +20,11 @@ TABLE_STYLE = {
     "legend.fontsize": 12,
     "font.family": "sans-serif",
 }
-plt.rcParams.update(TABLE_STYLE)
 
 
 def save_plot(fig, filename):
+    import matplotlib.pyplot as plt
+
     output_dir = "dashboard/figures"
     os.makedirs(output_dir, exist_ok=True)
     path = os.path.join(output_dir, filename)
@@ -39,12 +34,17 @@ def save_plot(fig, filename):
 
 
 def generate_dashboard():
+    # Plotting libraries are imported here so importing this module stays cheap
+    import numpy as np
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    import joblib
+
+    plt.rcParams.update(TABLE_STYLE)
     logging.info("Generating Dashboard Figures...")
 
     # Load Data
-    df = load_data("data/raw/MachineLearningRating.txt")
-    builder = DataBuilder(df)
-    builder.preprocess()
+    builder = load_features("data/raw/MachineLearningRating.txt")
     df_clean = builder.df
 
     # 1. Premium vs Claims (Scatter)
@@ -0,0 +1,86 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from src.features.build_features import DataBuilder
+from src.features.feature_store import FeatureStore
+
+
+def _make_store(tmp_path):
+    raw = tmp_path / "raw.txt"
+    raw.write_text("placeholder")
+    return FeatureStore(str(tmp_path / "store")), str(raw)
+
+
+def _builder(df):
+    builder = DataBuilder(df)
+    builder.encoders = {"Province": "encoder"}
+    return builder
+
+
+def test_round_trip_bool_int_float(tmp_path):
+    store, raw = _make_store(tmp_path)
+    df = pd.DataFrame(
+        {
+            "IsVATRegistered": [True, False, True],
+            "Province": np.array([0, 2, 1], dtype=np.int64),
+            "TotalPremium": [10.5, 0.0, 3.25],
+        }
+    )
+    store.write(_builder(df), raw)
+
+    loaded, encoders = store.open(raw)
+    pd.testing.assert_frame_equal(loaded.copy(deep=True), df)
+    assert loaded["IsVATRegistered"].dtype == bool
+    assert encoders == {"Province": "encoder"}
+
+
+def test_existing_version_is_not_rewritten(tmp_path):
+    store, raw = _make_store(tmp_path)
+    store.write(_builder(pd.DataFrame({"a": [1, 2, 3]})), raw)
+    loaded, _ = store.open(raw)
+
+    store.write(_builder(pd.DataFrame({"a": [7, 8, 9]})), raw)
+    assert store.open(raw)[0]["a"].tolist() == [1, 2, 3]
+
+    # replace=True publishes a new directory; existing mmaps keep old data
+    store.write(_builder(pd.DataFrame({"a": [7, 8, 9]})), raw, replace=True)
+    assert loaded["a"].tolist() == [1, 2, 3]
+    assert store.open(raw)[0]["a"].tolist() == [7, 8, 9]
+    # No temporary or stale directories are left behind
+    assert [p.name for p in (tmp_path / "store").iterdir()] == [
+        os.path.basename(store.version_dir(raw))
+    ]
+
+
+def test_concurrently_published_version_is_kept(tmp_path, monkeypatch):
+    store, raw = _make_store(tmp_path)
+    store.write(_builder(pd.DataFrame({"a": [1, 2, 3]})), raw)
+
+    # Simulate another process publishing between our exists() check and rename
+    monkeypatch.setattr(store, "exists", lambda data_path: False)
+    store.write(_builder(pd.DataFrame({"a": [7, 8, 9]})), raw)
+
+    assert store.open(raw)[0]["a"].tolist() == [1, 2, 3]
+    assert len(os.listdir(tmp_path / "store")) == 1
+
+
+def test_superseded_versions_are_pruned(tmp_path):
+    store, raw = _make_store(tmp_path)
+    other = tmp_path / "other.txt"
+    other.write_text("another source")
+    store.write(_builder(pd.DataFrame({"a": [1]})), str(other))
+    store.write(_builder(pd.DataFrame({"a": [1]})), raw)
+    old_dir = store.version_dir(raw)
+
+    # A new raw drop at the same path gets a new version directory
+    os.utime(raw, ns=(0, 12345))
+    store.write(_builder(pd.DataFrame({"a": [2]})), raw)
+
+    remaining = set(os.listdir(tmp_path / "store"))
+    assert os.path.basename(old_dir) not in remaining
+    assert remaining == {
+        os.path.basename(store.version_dir(raw)),
+        os.path.basename(store.version_dir(str(other))),
+    }
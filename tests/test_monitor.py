@@ -0,0 +1,198 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.monitor import (
+    CategorySketch,
+    DataProfile,
+    NumericSketch,
+    check_drift,
+    compare_profiles,
+    has_drift,
+    profile_file,
+)
+from src.features.build_features import CURRENT_YEAR, MAX_VEHICLE_AGE
+
+
+def _frame(n=5000, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(
+        {
+            "PolicyID": np.arange(n),
+            "Province": rng.choice(["Gauteng", "Western Cape", "Limpopo"], n),
+            "TotalPremium": rng.lognormal(3, 1, n),
+            "TotalClaims": np.where(rng.random(n) < 0.1, rng.lognormal(8, 1, n), 0.0),
+            "SumInsured": rng.normal(0, 1000, n),
+        }
+    )
+
+
+def _profile(df):
+    profile = DataProfile()
+    profile.update(df)
+    return profile.finalize()
+
+
+def _payload(profile):
+    return {c: s.to_dict() for c, s in profile.features.items()}, {
+        seg: {c: s.to_dict() for c, s in sk.items()}
+        for seg, sk in profile.segments.items()
+    }
+
+
+def test_merged_chunk_profiles_equal_single_pass():
+    df = _frame()
+    single = _profile(df)
+
+    merged = DataProfile()
+    for start in range(0, len(df), 700):
+        merged.merge(_profile(df.iloc[start : start + 700]))
+
+    assert merged.n_rows == single.n_rows
+    assert _payload(merged) == _payload(single)
+
+
+def test_quantiles_within_relative_accuracy():
+    values = np.random.default_rng(1).lognormal(5, 2, 20000)
+    sketch = NumericSketch(relative_accuracy=0.01)
+    for chunk in np.array_split(values, 7):
+        sketch.update(chunk)
+
+    for q in [0.01, 0.1, 0.5, 0.9, 0.99]:
+        exact = np.quantile(values, q, method="inverted_cdf")
+        assert abs(sketch.quantile(q) - exact) <= 0.01 * exact
+
+
+def test_category_sketch_keeps_heavy_hitters():
+    values = ["a"] * 500 + ["b"] * 300 + [f"rare{i}" for i in range(200)]
+    sketch = CategorySketch(capacity=10)
+    for chunk in np.array_split(np.array(values, dtype=object), 4):
+        sketch.update(chunk)
+    assert {"a", "b"} <= set(sketch.counters)
+    assert sketch.counters["a"] >= 500 - len(values) / 11
+
+
+def test_identical_data_has_no_drift():
+    df = _frame()
+    report = compare_profiles(_profile(df), _profile(df))
+    assert (report["PSI"] < 1e-6).all()
+    assert (report["Status"] == "OK").all()
+
+
+def test_shifted_data_is_flagged():
+    ref = _frame()
+    new = ref.assign(TotalPremium=ref["TotalPremium"] * 3)
+    report = compare_profiles(_profile(ref), _profile(new)).set_index(
+        ["Segment", "Feature"]
+    )
+    assert report.loc[("ALL", "TotalPremium"), "Status"] == "DRIFT"
+    assert report.loc[("ALL", "Province"), "Status"] == "OK"
+
+
+def test_id_columns_are_not_profiled():
+    assert "PolicyID" not in _profile(_frame()).features
+
+
+def test_reference_pins_sketch_kind(tmp_path):
+    # First chunk of the new drop is all-null, later chunks hold strings
+    ref_path = tmp_path / "ref.txt"
+    new_path = tmp_path / "new.txt"
+    pd.DataFrame({"Bank": ["ABSA", "FNB"] * 50}).to_csv(ref_path, sep="|", index=False)
+    pd.DataFrame({"Bank": [None] * 50 + ["ABSA", "FNB"] * 25}).to_csv(
+        new_path, sep="|", index=False
+    )
+
+    reference = profile_file(str(ref_path))
+    new = profile_file(str(new_path), chunksize=50, reference=reference)
+    assert isinstance(new.features["Bank"], CategorySketch)
+    assert new.features["Bank"].nulls == 50
+
+    # Without a reference the all-null first chunk is deferred, not typed float
+    unpinned = profile_file(str(new_path), chunksize=50)
+    assert isinstance(unpinned.features["Bank"], CategorySketch)
+    assert unpinned.features["Bank"].count == 100
+
+
+@pytest.mark.parametrize("cls", [NumericSketch, CategorySketch])
+def test_sketch_round_trips_through_dict(cls):
+    sketch = cls()
+    sketch.update(pd.Series([1.0, 2.0, None, 3.0]))
+    restored = cls.from_dict(sketch.to_dict())
+    assert restored.to_dict() == sketch.to_dict()
+
+
+def test_cli_monitor_exit_status(tmp_path):
+    from src.cli import main
+
+    ref, new = tmp_path / "ref.txt", tmp_path / "new.txt"
+    _frame().to_csv(ref, sep="|", index=False)
+    reference = tmp_path / "reference.json"
+    profile_file(str(ref)).save(str(reference))
+    args = ["--reference", str(reference), "--output", str(tmp_path / "report.csv")]
+
+    assert main(["monitor", "--data", str(ref), *args]) == 0
+
+    shifted = _frame()
+    shifted["TotalPremium"] *= 3
+    shifted.to_csv(new, sep="|", index=False)
+    assert main(["monitor", "--data", str(new), *args]) == 1
+
+
+def _book(n, seed):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(
+        {
+            "VehicleType": rng.choice(
+                ["Passenger", "Medium", "Heavy", "Bus"], n, p=[0.9, 0.07, 0.02, 0.01]
+            ),
+            "TotalPremium": rng.lognormal(3, 1, n),
+            "SumInsured": rng.lognormal(10, 1.5, n),
+        }
+    )
+
+
+def test_resampled_drops_from_same_distribution_do_not_fail():
+    reference = _profile(_book(20000, seed=0))
+    for seed in range(1, 21):
+        report = compare_profiles(reference, _profile(_book(20000, seed=seed)))
+        assert not has_drift(report), report[report["Status"] == "DRIFT"]
+
+    # Rare segments are reported, not scored
+    bus = report[report["Segment"] == "VehicleType=Bus"]
+    assert (bus["Status"] == "LOW_COUNT").all()
+
+
+def test_quality_checks_fail_and_are_logged(caplog, tmp_path):
+    ref = _frame()
+    new = ref.copy()
+    new.loc[new.sample(frac=0.8, random_state=0).index, "SumInsured"] = np.nan
+    new.loc[:99, "TotalPremium"] = np.inf
+
+    report = compare_profiles(_profile(ref), _profile(new)).set_index(
+        ["Segment", "Feature"]
+    )
+    assert report.loc[("ALL", "SumInsured"), "Status"] == "QUALITY"
+    assert "null rate" in report.loc[("ALL", "SumInsured"), "Issues"]
+    assert report.loc[("ALL", "TotalPremium"), "Status"] == "QUALITY"
+    assert "inf rate" in report.loc[("ALL", "TotalPremium"), "Issues"]
+    assert has_drift(report.reset_index())
+
+    reference = tmp_path / "reference.json"
+    ref.to_csv(tmp_path / "ref.txt", sep="|", index=False)
+    new.to_csv(tmp_path / "new.txt", sep="|", index=False)
+    profile_file(str(tmp_path / "ref.txt")).save(str(reference))
+    with caplog.at_level("WARNING"):
+        check_drift(str(tmp_path / "new.txt"), reference_path=str(reference))
+    assert "[QUALITY] ALL / SumInsured: null rate" in caplog.text
+
+
+def test_out_of_range_rate_is_a_quality_failure():
+    rng = np.random.default_rng(0)
+    ref = pd.DataFrame({"RegistrationYear": rng.integers(1990, 2021, 5000)})
+    new = ref.copy()
+    # A few percent just below the valid range barely moves the distribution
+    new.loc[:149, "RegistrationYear"] = CURRENT_YEAR - MAX_VEHICLE_AGE - 1
+    report = compare_profiles(_profile(ref), _profile(new))
+    row = report.set_index("Feature").loc["RegistrationYear"]
+    assert row["Status"] == "QUALITY"
+    assert "out-of-range" in row["Issues"]
@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.models.pricing import claim_frequency
+
+
+class _BalancedModel:
+    """
+    Stand-in for a class-balanced classifier with a fixed predicted probability.
+    """
+
+    def __init__(self, prob, base_rate=None):
+        self.prob = prob
+        if base_rate is not None:
+            self.train_base_rate_ = base_rate
+            self.weighted_base_rate_ = 0.5
+
+    def predict_proba(self, X):
+        p = np.full(len(X), self.prob)
+        return np.column_stack([1 - p, p])
+
+
+def test_claim_frequency_maps_balanced_prior_back_to_base_rate():
+    X = pd.DataFrame({"a": range(5)})
+    freq = claim_frequency(_BalancedModel(0.5, base_rate=0.003), X)
+    np.testing.assert_allclose(freq, 0.003)
+
+
+def test_claim_frequency_preserves_ordering():
+    X = pd.DataFrame({"a": range(2)})
+    low = claim_frequency(_BalancedModel(0.3, base_rate=0.01), X)[0]
+    high = claim_frequency(_BalancedModel(0.7, base_rate=0.01), X)[0]
+    assert 0 < low < 0.01 < high < 1
+
+
+def test_claim_frequency_requires_base_rate():
+    with pytest.raises(ValueError):
+        claim_frequency(_BalancedModel(0.5), pd.DataFrame({"a": [1]}))
@@ -0,0 +1,65 @@
+import joblib
+import pandas as pd
+import pytest
+
+from src.features.build_features import DataBuilder
+from src.models.train_model import LazyModelStore, ModelTrainer
+
+
+def test_lazy_store_discovers_saved_models(tmp_path):
+    LazyModelStore(str(tmp_path)).add("Severity_XGB", {"weights": [1, 2]})
+    joblib.dump("not a model", tmp_path / "severity_model.pkl")
+
+    trainer = ModelTrainer(model_dir=str(tmp_path))
+    assert "Severity_XGB" in trainer.models
+    assert "severity_model" not in trainer.models
+    assert trainer.models["Severity_XGB"] == {"weights": [1, 2]}
+
+
+def test_lazy_store_keeps_at_most_max_loaded(tmp_path):
+    store = LazyModelStore(str(tmp_path), max_loaded=1)
+    store.add("A_LR", "a")
+    store.add("B_LR", "b")
+    assert store["A_LR"] == "a" and store["B_LR"] == "b"
+    assert list(store._loaded) == ["B_LR"]
+
+
+def _builder():
+    df = pd.DataFrame(
+        {
+            "TotalClaims": [0.0, 5.0, 0.0, 10.0],
+            "IsClaim": [0, 1, 0, 1],
+            "TotalPremium": [2.0, 4.0, 0.0, 8.0],
+            "Province": [0, 0, 1, 1],
+        }
+    )
+    return DataBuilder(df)
+
+
+def test_get_target_data_applies_query():
+    X, y = _builder().get_target_data(
+        "TotalClaims / TotalPremium", task="regression", query="TotalPremium > 0"
+    )
+    assert y.tolist() == [0.0, 1.25, 1.25]
+    assert "TotalClaims" not in X.columns
+
+
+def test_get_target_data_rejects_unknown_keys():
+    with pytest.raises(TypeError):
+        _builder().get_target_data("TotalClaims", filtr="TotalClaims > 0")
+
+
+def test_best_trained_ignores_models_from_earlier_runs(tmp_path):
+    # e.g. XGBoost was installed for the previous run but not this one
+    LazyModelStore(str(tmp_path)).add("Severity_XGB", "stale")
+
+    trainer = ModelTrainer(model_dir=str(tmp_path))
+    X = pd.DataFrame({"a": [1.0, 2.0, 3.0, 4.0, 5.0]})
+    y = pd.Series([1.0, 2.0, 3.0, 4.0, 5.0])
+    trainer.train_target("Severity", "regression", X, X, y, y)
+
+    assert "Severity_XGB" in trainer.models
+    expected = "Severity_XGB" if "Severity_XGB" in trainer.trained else "Severity_RF"
+    assert trainer.best_trained("Severity") == expected
+    with pytest.raises(KeyError):
+        trainer.best_trained("Probability")